@@ -1,67 +1,211 @@
 import os
+import re
 import time
 import configparser
 import argparse
+import concurrent.futures
+import logging
+import threading
 import mysql.connector
+import mysql.connector.pooling
 import shutil
+from collections import OrderedDict
 from datetime import datetime
 
+# watchdog is optional; without it the agent falls back to polling
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
 # Import the setup_logger function
 from logging_setup import setup_logger
 
 # Initialize logger
 logger = setup_logger("BPCM_Agent", "general.log", "error.log")
 
+# Maximum number of already-seen files remembered between polls
+PROCESSED_FILES_LIMIT = 50000
+
+# How long a file's size/mtime must be stable before it is considered fully written
+SETTLE_SECONDS = 1
+
+# Maximum number of candidate files handled per poll; a larger backlog is
+# drained across successive polls instead of in one giant tick
+SCAN_BATCH_SIZE = 500
+
+# Playlist filename layout: 3-char prefix, one separator char, DDMMYYYY date,
+# "-<version>" and the file extension
+FILENAME_RE = re.compile(r'^(?P<prefix>.{3}).(?P<date>\d{8})-(?P<version>[^.]+)(?P<ext>\.[^.]+)$')
+
+# Single-line SQL so every send is byte-identical for prepared-statement reuse
+SQL_INSERT_FAILURE = (
+    "INSERT INTO playlist_process (channeluid, playlistfilename, playlistinputpath, playlistoutputpath, "
+    "playlistfileversion, status, remarks, createdby, updatedby) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+)
+SQL_INSERT_SUCCESS = (
+    "INSERT INTO playlist_process (channeluid, playlistfilename, playlistfileversion, playlistinputpath, "
+    "playlistoutputpath, playlistdate, status, createdby, updatedby) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+)
+
+# Filesystems where inotify does not report remote changes reliably
+NETWORK_FS_TYPES = {"nfs", "nfs4", "cifs", "smbfs", "fuse.sshfs", "9p"}
+
+
+def is_network_filesystem(path):
+    """Return True if the path lives on a network filesystem where inotify is unreliable."""
+    path = os.path.realpath(path)
+    best_fstype = None
+    best_length = -1
+    try:
+        with open("/proc/mounts") as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point, fstype = fields[1], fields[2]
+                if path == mount_point or path.startswith(mount_point.rstrip("/") + "/"):
+                    if len(mount_point) > best_length:
+                        best_length = len(mount_point)
+                        best_fstype = fstype
+    except OSError:
+        return False
+    return best_fstype in NETWORK_FS_TYPES
+
 class DatabaseConnection:
     def __init__(self, config):
-        """Initialize database connection using configuration from the INI file."""
+        """Initialize a MySQL connection pool using configuration from the INI file."""
         self.host = config.get('database', 'host')
         self.port = config.getint('database', 'port', fallback=3306)
         self.user = config.get('database', 'user')
         self.password = config.get('database', 'password')
         self.database = config.get('database', 'database')
-        self.conn = self.connect_to_mysql()
+        self.pool = self.create_pool()
+        # Prepared-statement cache: query -> (connection, prepared cursor). The
+        # connection stays checked out of the pool for the cursor's lifetime.
+        self._prepared = {}
+        self._prepared_lock = threading.Lock()
 
-    def connect_to_mysql(self):
-        """Connect to MySQL database using credentials from the INI file."""
+    def create_pool(self):
+        """Create a MySQL connection pool using credentials from the INI file."""
         try:
-            conn = mysql.connector.connect(
+            pool = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name="bpcm",
+                pool_size=8,
+                pool_reset_session=False,
                 host=self.host,
                 port=self.port,
                 user=self.user,
                 password=self.password,
-                database=self.database
+                database=self.database,
+                autocommit=True
             )
-            return conn
+            return pool
         except mysql.connector.Error as e:
-            logger.error(f"Error connecting to MySQL: {e}")
+            logger.error(f"Error creating MySQL connection pool: {e}")
             return None
 
     def execute_query(self, query, params=None):
-        """Execute a SQL query."""
-        cursor = self.conn.cursor()
-        try:
-            cursor.execute(query, params or ())
-            self.conn.commit()
-            return cursor
-        except mysql.connector.Error as e:
-            logger.error(f"Error executing query: {e}")
+        """Execute a SQL statement on a pooled connection, retrying once if the connection is stale.
+
+        Returns True on success. The cursor is closed and the connection
+        released back to the pool before returning, so no result set is
+        exposed; use fetch_one for queries that return rows.
+        """
+        for attempt in range(2):
+            try:
+                conn = self.pool.get_connection()
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute(query, params or ())
+                    cursor.close()
+                    return True
+                finally:
+                    conn.close()
+            except mysql.connector.OperationalError as e:
+                logger.warning(f"Stale pooled connection, retrying query: {e}")
+            except mysql.connector.Error as e:
+                logger.error(f"Error executing query: {e}")
+                return False
+        logger.error("Error executing query: retries exhausted")
+        return False
+
+    def _prepared_cursor(self, query):
+        """Return a cached prepared cursor for the query, preparing it on first use."""
+        cached = self._prepared.get(query)
+        if cached is None:
+            conn = self.pool.get_connection()
+            cached = (conn, conn.cursor(prepared=True))
+            self._prepared[query] = cached
+        return cached
+
+    def _discard_prepared(self, query):
+        """Drop a cached prepared cursor whose connection has gone stale."""
+        cached = self._prepared.pop(query, None)
+        if cached:
+            conn, cursor = cached
+            try:
+                cursor.close()
+                conn.close()
+            except mysql.connector.Error:
+                pass
+
+    def execute_many(self, query, rows):
+        """Execute a prepared SQL statement for a batch of parameter rows.
+
+        The statement is prepared on the server once per query string, so
+        repeated batches only send parameter values. The whole batch runs in
+        one explicit transaction so the server fsyncs once, not once per row.
+        """
+        with self._prepared_lock:
+            for attempt in range(2):
+                conn = None
+                try:
+                    conn, cursor = self._prepared_cursor(query)
+                    conn.start_transaction()
+                    cursor.executemany(query, rows)
+                    conn.commit()
+                    return cursor
+                except mysql.connector.OperationalError as e:
+                    logger.warning(f"Stale prepared-statement connection, retrying batch: {e}")
+                    self._discard_prepared(query)
+                except mysql.connector.Error as e:
+                    logger.error(f"Error executing batch query: {e}")
+                    if conn is not None:
+                        try:
+                            conn.rollback()
+                        except mysql.connector.Error:
+                            self._discard_prepared(query)
+                    return None
+            logger.error("Error executing batch query: retries exhausted")
             return None
 
     def fetch_one(self, query, params=None):
-        """Fetch a single row from the database."""
-        cursor = self.conn.cursor()
-        try:
-            cursor.execute(query, params or ())
-            return cursor.fetchone()
-        except mysql.connector.Error as e:
-            logger.error(f"Error fetching data: {e}")
-            return None
+        """Fetch a single row from the database, retrying once if the connection is stale."""
+        for attempt in range(2):
+            try:
+                conn = self.pool.get_connection()
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute(query, params or ())
+                    return cursor.fetchone()
+                finally:
+                    conn.close()
+            except mysql.connector.OperationalError as e:
+                logger.warning(f"Stale pooled connection, retrying fetch: {e}")
+            except mysql.connector.Error as e:
+                logger.error(f"Error fetching data: {e}")
+                return None
+        logger.error("Error fetching data: retries exhausted")
+        return None
 
     def close(self):
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
+        """Close the database connection. Pooled connections are released per query."""
+        pass
 
 
 class FileProcessor:
@@ -69,7 +213,50 @@ class FileProcessor:
         self.db_connection = db_connection
         self.config = self.fetch_playlist_configuration()
         self.watch_dirs = self.parse_watch_directories(self.config['playlistwatchfolder'])
-        self.processed_files = set()  # Track processed files to avoid reprocessing
+        # Hot-path config values bound once so per-file processing avoids dict lookups
+        self._prefix = self.config['playlistnameprefix']
+        self._ext = self.config['playlistextension'].lower()
+        self._input_dir = self.config['playlistinputlocation']
+        self._output_dir = self.config['playlistoutputlocation']
+        self._channeluid = self.config['channeluid']
+        self._createdby = self.config['createdby']
+        self._updatedby = self.config['updatedby']
+        # Device ID per watch dir, captured once: it disambiguates inode keys
+        # across filesystems and decides whether a move can be a rename
+        self._dir_devs = {}
+        for dir_path in self.watch_dirs:
+            try:
+                self._dir_devs[dir_path] = os.stat(dir_path).st_dev
+            except OSError as e:
+                logger.warning(f"Could not stat watch directory {dir_path}: {e}")
+        # Watch dirs on the same filesystem as the input dir can move files with a
+        # single rename() instead of shutil.move's copy-fallback machinery
+        try:
+            input_dev = os.stat(self._input_dir).st_dev
+        except OSError as e:
+            logger.warning(f"Could not compare filesystems, using shutil.move: {e}")
+            self._same_fs = {}
+        else:
+            self._same_fs = {d: dev == input_dev for d, dev in self._dir_devs.items()}
+        # Specialized per-file processor with the hot values bound as locals
+        self.process_file = self._make_processor()
+        # LRU of (st_dev, st_ino) keys for files left behind in the watch dirs;
+        # successfully processed files are moved out, so only failures need tracking
+        self.processed_files = OrderedDict()
+        self._processed_lock = threading.Lock()
+        # Last seen st_mtime_ns per watch dir; an unchanged mtime means no
+        # entries were added or removed, so the enumeration can be skipped
+        self._dir_mtimes = {}
+        # In-progress candidate generator; survives across polls so a large
+        # backlog is drained SCAN_BATCH_SIZE files at a time
+        self._scan_iter = None
+        # Dirs whose current enumeration had a settle-deferred file; persists
+        # across polls because a dir's end-of-enumeration marker can arrive
+        # batches after the deferral. Cleared when the dir is re-enumerated.
+        self._deferred_dirs = set()
+        # File moves are I/O-bound, so overlap them instead of blocking the scan
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=(os.cpu_count() or 4) + 4)
 
     def fetch_playlist_configuration(self):
         """Fetch playlist configuration from the database."""
@@ -82,7 +269,7 @@ class FileProcessor:
         result = self.db_connection.fetch_one(query)
         if result:
             # Log the raw value of playlistwatchfolder for debugging
-            logger.info(f"playlistwatchfolder value from database: {result[1]}")
+            logger.info("playlistwatchfolder value from database: %s", result[1])
             
             return {
                 'channeluid': result[0],
@@ -104,13 +291,13 @@ class FileProcessor:
             raise ValueError("No watch directories configured.")
         
         # Log the raw watch_folder_config for debugging
-        logger.info(f"Raw watch_folder_config: {watch_folder_config}")
+        logger.info("Raw watch_folder_config: %s", watch_folder_config)
         
         # Split by comma and strip extra spaces
         watch_dirs = [dir_path.strip() for dir_path in watch_folder_config.split(",") if dir_path.strip()]
         
         # Log the parsed watch directories for debugging
-        logger.info(f"Parsed watch directories: {watch_dirs}")
+        logger.info("Parsed watch directories: %s", watch_dirs)
         
         # Ensure all directories exist
         valid_watch_dirs = []
@@ -126,90 +313,305 @@ class FileProcessor:
         return valid_watch_dirs
 
     def scan_and_process_files(self):
-        """Scan watch directories and process new files."""
-        for watch_dir in self.watch_dirs:
-            if not os.path.exists(watch_dir):
-                logger.warning(f"Watch directory does not exist: {watch_dir}")
+        """Process up to SCAN_BATCH_SIZE new files, resuming where the last poll stopped.
+
+        Returns the number of candidate files drawn this call, so callers can
+        keep draining until a backlog is exhausted.
+        """
+        if self._scan_iter is None:
+            self._scan_iter = self._build_scan_iter()
+
+        batch = []           # ('file', ...) candidates drawn this poll
+        completed_dirs = []  # dirs fully drained this poll, with their mtimes
+        while len(batch) < SCAN_BATCH_SIZE:
+            item = next(self._scan_iter, None)
+            if item is None:
+                self._scan_iter = None  # exhausted; rebuilt on the next poll
+                break
+            if item[0] == 'file':
+                batch.append(item[1:])
+            else:
+                completed_dirs.append(item[1:])
+
+        if not batch:
+            self._record_dir_mtimes(completed_dirs)
+            return 0
+
+        # One stat pass, one shared sleep, one re-stat pass: the settle
+        # window costs SETTLE_SECONDS regardless of the batch size
+        settled = self.settle_candidates([path for _, path, _ in batch])
+        pending = []
+        for (key, file_path, watch_dir), ready in zip(batch, settled):
+            if not ready:
+                self._deferred_dirs.add(watch_dir)
+                continue  # still being written; picked up on the next poll
+            pending.append((key, self._executor.submit(self.process_file, file_path)))
+
+        success_rows = []
+        failure_rows = []
+        for key, future in pending:
+            result = future.result()
+            if result:
+                kind, row = result
+                if kind == 'success':
+                    success_rows.append(row)
+                else:
+                    failure_rows.append(row)
+            # Successes are moved out of the watch dir; remember everything else
+            if not result or result[0] != 'success':
+                self.remember_processed(key)
+
+        if failure_rows:
+            self.insert_validation_failures(failure_rows)
+        if success_rows:
+            self.insert_into_playlist_process(success_rows)
+
+        self._record_dir_mtimes(completed_dirs)
+
+        return len(batch)
+
+    def _record_dir_mtimes(self, completed_dirs):
+        """Remember drained dirs' mtimes, unless their enumeration deferred a file.
+
+        A deferred file must be rescanned even though finishing its write
+        won't change the directory mtime, so a dir with any deferral — in
+        this poll or an earlier one of the same enumeration — stays eligible
+        for re-enumeration.
+        """
+        for watch_dir, dir_mtime in completed_dirs:
+            if watch_dir not in self._deferred_dirs:
+                self._dir_mtimes[watch_dir] = dir_mtime
+
+    def _build_scan_iter(self):
+        """Yield new-file candidates across every changed watch dir.
+
+        Produces ('file', key, path, watch_dir) for each candidate, followed
+        by a ('dir', watch_dir, mtime) marker once that dir is drained so the
+        consumer knows when its mtime may be recorded.
+        """
+        # List all changed watch dirs concurrently; on multi-disk setups the
+        # readdir calls overlap instead of running back to back
+        listings = {}
+        for watch_dir in list(self.watch_dirs):
+            try:
+                dir_mtime = os.stat(watch_dir).st_mtime_ns
+            except FileNotFoundError:
+                logger.warning(f"Watch directory disappeared, removing from scan: {watch_dir}")
+                self.watch_dirs.remove(watch_dir)
+                continue
+            if dir_mtime == self._dir_mtimes.get(watch_dir):
                 continue
+            listings[self._executor.submit(self._list_dir, watch_dir)] = (watch_dir, dir_mtime)
 
-            for filename in os.listdir(watch_dir):
-                file_path = os.path.join(watch_dir, filename)
-                if os.path.isfile(file_path) and file_path not in self.processed_files:
-                    self.process_file(file_path)
-                    self.processed_files.add(file_path)
-
-    def process_file(self, file_path):
-        """Process the file."""
-        filename = os.path.basename(file_path)
-        prefix = filename[0:3]
-        extension = os.path.splitext(filename)[1].lower()
-        date_string = filename.split('-')[0][4:]
-        fileversion = filename.split('-')[1].split('.')[0]
-        try:
-            playlist_date = datetime.strptime(date_string, "%d%m%Y").strftime("%Y-%m-%d")
-        except ValueError:
-            self.handle_validation_failure(file_path, filename, fileversion, "Invalid date format")
-            return
+        for future in concurrent.futures.as_completed(listings):
+            watch_dir, dir_mtime = listings[future]
+            try:
+                entries = future.result()
+            except FileNotFoundError:
+                logger.warning(f"Watch directory disappeared, removing from scan: {watch_dir}")
+                self.watch_dirs.remove(watch_dir)
+                continue
 
-        # Validate file
-        if prefix != self.config['playlistnameprefix']:
-            self.handle_validation_failure(file_path, filename, fileversion, "Invalid prefix")
-            return
-        if extension != self.config['playlistextension']:
-            self.handle_validation_failure(file_path, filename, fileversion, "Invalid file extension")
-            return
+            # Fresh enumeration supersedes any deferral recorded for this dir;
+            # a still-unsettled file will simply be yielded and deferred again
+            self._deferred_dirs.discard(watch_dir)
+
+            dir_dev = self._dir_devs.get(watch_dir)
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                # Unrelated files (wrong prefix or extension) are not
+                # playlists at all — skip them without a database row
+                if not self.looks_like_playlist(entry.name):
+                    continue
+                key = (dir_dev, entry.inode())
+                with self._processed_lock:
+                    if key in self.processed_files:
+                        self.processed_files.move_to_end(key)
+                        continue
+                yield ('file', key, entry.path, watch_dir)
+
+            yield ('dir', watch_dir, dir_mtime)
+
+    def _list_dir(self, watch_dir):
+        """List a watch dir's entries, sorted by inode for better on-disk locality."""
+        with os.scandir(watch_dir) as entries:
+            listing = list(entries)
+        listing.sort(key=lambda entry: entry.inode())
+        return listing
+
+    def looks_like_playlist(self, filename):
+        """Cheap name check: does the file carry the configured prefix and extension?"""
+        return filename.startswith(self._prefix) and filename.lower().endswith(self._ext)
+
+    def settle_candidates(self, paths):
+        """Return a stability flag per path: size and mtime unchanged across one settle window.
 
-        # Move file to input directory
-        input_file_path = os.path.join(self.config['playlistinputlocation'], filename)
+        All candidates are stat'd, the scan thread sleeps once, and all are
+        stat'd again — the settle window costs SETTLE_SECONDS of wall time
+        for any number of files and never occupies an executor worker.
+        """
+        def snapshot(path):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                return None
+            return (st.st_size, st.st_mtime)
+
+        before = [snapshot(path) for path in paths]
+        time.sleep(SETTLE_SECONDS)
+        return [snap is not None and snapshot(path) == snap
+                for path, snap in zip(paths, before)]
+
+    def process_new_file(self, file_path):
+        """Process a single newly arrived file and flush its database row immediately."""
+        if not self.looks_like_playlist(os.path.basename(file_path)):
+            return
         try:
-            shutil.move(file_path, input_file_path)
-            logger.info(f"File {filename} moved successfully to {input_file_path}.")
-        except Exception as e:
-            logger.error(f"Error moving file: {e}")
+            stat = os.stat(file_path)
+        except FileNotFoundError:
             return
+        key = (stat.st_dev, stat.st_ino)
+        with self._processed_lock:
+            if key in self.processed_files:
+                return
+        result = self.process_file(file_path)
+        if result:
+            kind, row = result
+            if kind == 'success':
+                self.insert_into_playlist_process([row])
+            else:
+                self.insert_validation_failures([row])
+        if not result or result[0] != 'success':
+            self.remember_processed(key)
 
-        # Insert metadata into playlist_process table
-        self.insert_into_playlist_process(filename, playlist_date, fileversion)
+    def remember_processed(self, key):
+        """Record a file left in a watch dir, evicting the oldest entry when full."""
+        with self._processed_lock:
+            self.processed_files[key] = None
+            self.processed_files.move_to_end(key)
+            if len(self.processed_files) > PROCESSED_FILES_LIMIT:
+                self.processed_files.popitem(last=False)
 
-    def handle_validation_failure(self, file_path, filename, fileversion, reason):
-        """Handle validation failure by updating the database."""
-        query = """
-        INSERT INTO playlist_process (channeluid, playlistfilename, playlistinputpath, playlistoutputpath, 
-                                     playlistfileversion, status, remarks, createdby, updatedby)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        self.db_connection.execute_query(query, (
-            self.config['channeluid'], filename, self.config['playlistinputlocation'],
-            self.config['playlistoutputlocation'], fileversion, 99, reason,
-            self.config['createdby'], self.config['updatedby']
-        ))
-        logger.warning(f"Validation failed for {filename}: {reason}")
+    def _make_processor(self):
+        """Build the per-file processor as a closure over the hot values.
 
-    def insert_into_playlist_process(self, filename, playlist_date, fileversion):
-        """Insert metadata into playlist_process table."""
-        query = """
-        INSERT INTO playlist_process (channeluid, playlistfilename, playlistfileversion, playlistinputpath, 
-                                     playlistoutputpath, playlistdate, status, createdby, updatedby)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        Everything the per-file path touches — the compiled pattern, config
+        values and the handful of os helpers — is bound to closure locals, so
+        the interpreter resolves them as fast locals instead of repeating
+        attribute and global lookups for every file.
         """
-        self.db_connection.execute_query(query, (
-            self.config['channeluid'], filename, fileversion, self.config['playlistinputlocation'],
-            self.config['playlistoutputlocation'], playlist_date, 0,
-            self.config['createdby'], self.config['updatedby']
+        match_name = FILENAME_RE.match
+        strptime = datetime.strptime
+        basename = os.path.basename
+        dirname = os.path.dirname
+        join = os.path.join
+        validation_failure = self.validation_failure
+        name_prefix = self._prefix
+        name_ext = self._ext
+        input_dir = self._input_dir
+        output_dir = self._output_dir
+        channeluid = self._channeluid
+        createdby = self._createdby
+        updatedby = self._updatedby
+        same_fs = self._same_fs
+
+        def process_file(file_path):
+            """Process the file and return a ('success'|'failure', row) result, or None."""
+            filename = basename(file_path)
+            match = match_name(filename)
+            if not match:
+                return validation_failure(filename, None, "Invalid filename format")
+            prefix = match['prefix']
+            extension = match['ext'].lower()
+            fileversion = match['version']
+            try:
+                playlist_date = strptime(match['date'], "%d%m%Y").strftime("%Y-%m-%d")
+            except ValueError:
+                return validation_failure(filename, fileversion, "Invalid date format")
+
+            # Validate file
+            if prefix != name_prefix:
+                return validation_failure(filename, fileversion, "Invalid prefix")
+            if extension != name_ext:
+                return validation_failure(filename, fileversion, "Invalid file extension")
+
+            # Move file to input directory
+            input_file_path = join(input_dir, filename)
+            try:
+                if same_fs.get(dirname(file_path)):
+                    os.replace(file_path, input_file_path)
+                else:
+                    shutil.move(file_path, input_file_path)
+                logger.debug("File %s moved successfully to %s.", filename, input_file_path)
+            except Exception as e:
+                logger.error(f"Error moving file: {e}")
+                return None
+
+            return ('success', (
+                channeluid, filename, fileversion, input_dir,
+                output_dir, playlist_date, 0,
+                createdby, updatedby
+            ))
+
+        return process_file
+
+    def validation_failure(self, filename, fileversion, reason):
+        """Log a validation failure and build its playlist_process row."""
+        logger.warning("Validation failed for %s: %s", filename, reason)
+        return ('failure', (
+            self._channeluid, filename, self._input_dir,
+            self._output_dir, fileversion, 99, reason,
+            self._createdby, self._updatedby
         ))
-        logger.info(f"File {filename} processed successfully and added to playlist_process table.")
+
+    def insert_validation_failures(self, rows):
+        """Insert a batch of validation-failure rows into the playlist_process table."""
+        self.db_connection.execute_many(SQL_INSERT_FAILURE, rows)
+
+    def insert_into_playlist_process(self, rows):
+        """Insert a batch of processed-file rows into the playlist_process table."""
+        self.db_connection.execute_many(SQL_INSERT_SUCCESS, rows)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%d file(s) processed successfully and added to playlist_process table.", len(rows))
+
+
+class WatchDirEventHandler(FileSystemEventHandler):
+    """Dispatch inotify events for the watch directories to the file processor."""
+
+    def __init__(self, file_processor):
+        self.file_processor = file_processor
+
+    def on_closed(self, event):
+        if not event.is_directory:
+            self.file_processor.process_new_file(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.file_processor.process_new_file(event.dest_path)
+
+
+# Parsed INI files keyed by path, invalidated when the file's mtime changes
+_CONFIG_CACHE = {}
 
 
 def load_config(customer_name):
-    """Load database configuration from the INI file."""
+    """Load database configuration from the INI file, reusing the parse while the file is unchanged."""
     customer_name = customer_name.replace(" ", "")
     config_path = f"/etc/mdmgr/{customer_name}.ini"
-    if not os.path.exists(config_path):
+    try:
+        mtime = os.stat(config_path).st_mtime
+    except FileNotFoundError:
         logger.error(f"Configuration file not found: {config_path}")
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
+    cached = _CONFIG_CACHE.get(config_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
     config = configparser.ConfigParser()
     config.read(config_path)
+    _CONFIG_CACHE[config_path] = (mtime, config)
     logger.info(f"Configuration file loaded: {config_path}")
     return config
 
@@ -232,11 +634,40 @@ def main():
     # Initialize file processor
     file_processor = FileProcessor(db_connection)
 
-    # Polling loop
+    use_events = (Observer is not None and
+                  not any(is_network_filesystem(d) for d in file_processor.watch_dirs))
+
     try:
-        while True:
-            file_processor.scan_and_process_files()
-            time.sleep(10)  # Poll every 10 seconds
+        if use_events:
+            # Event-driven watcher: the kernel tells us when files arrive
+            observer = Observer()
+            handler = WatchDirEventHandler(file_processor)
+            for watch_dir in file_processor.watch_dirs:
+                observer.schedule(handler, watch_dir)
+            observer.start()
+            logger.info("Watching directories with filesystem events.")
+            # Drain files that arrived before the watcher was running. The
+            # watcher is already started, so nothing can land unseen in the
+            # gap; a file caught by both paths is skipped by the
+            # processed-files guard or fails its second move harmlessly.
+            while file_processor.scan_and_process_files():
+                pass
+            try:
+                while True:
+                    time.sleep(60)
+            finally:
+                observer.stop()
+                observer.join()
+        else:
+            if Observer is None:
+                logger.info("watchdog not installed; falling back to polling.")
+            else:
+                logger.info("Network filesystem detected; falling back to polling.")
+            while True:
+                # Drain everything outstanding one batch at a time, then sleep
+                while file_processor.scan_and_process_files():
+                    pass
+                time.sleep(10)  # Poll every 10 seconds
     except KeyboardInterrupt:
         logger.info("Stopping file processor...")
     finally: